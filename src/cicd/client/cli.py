@@ -1,9 +1,8 @@
 import typer
 from typing_extensions import Annotated
-from rich.console import Console
-from cicd.client.commands import cmd_init, cmd_preparedev, cmd_deploy
 
-console = Console() # 美化命令行输出
+# 注意：各子命令模块（及其背后的 InquirerPy / yaml / GitOps 等重依赖）
+# 在对应的命令函数体内才导入，保证 `cicd --help` 等短命令不必支付导入成本
 
 # 初始化主应用
 app = typer.Typer(
@@ -20,6 +19,7 @@ app = typer.Typer(
 @app.command()
 def init():
     """🛠️  初始化项目"""
+    from cicd.client.commands import cmd_init
     cmd_init.run()
 
 
@@ -38,6 +38,7 @@ def preparedev(
     2. 📝 [bold]交互创建[/]：询问分支类型 (Feat/Fix) 和名称。
     3. 🌿 [bold]自动切换[/]：创建并 Checkout 到新分支。
     """
+    from cicd.client.commands import cmd_preparedev
     cmd_preparedev.run(base_branch=base)
 
 
@@ -55,4 +56,5 @@ def deploy(
     2. 📤 [bold]同步推送[/]：推送代码并获取唯一的 Commit Hash。
     3. 📡 [bold]远程触发[/]：唤醒目标服务器 Worker 执行构建与部署。
     """
+    from cicd.client.commands import cmd_deploy
     cmd_deploy.run(env=env)
\ No newline at end of file
@@ -1,34 +1,42 @@
 """deploy 命令实现：代码推送与远程部署触发"""
 import os
-from rich.console import Console
-from rich.prompt import Confirm
-
+import re
+import shlex
+from cicd.common.console import console
 from cicd.common.git_ops import GitOps
 from cicd.common.ssh_ops import SSHOps
-from cicd.common.config_ops import ConfigOps
+from cicd.common.config_ops import get_config_ops
 
 
+# 合法分支名：字母、数字、下划线、点、斜杠、连字符
+# （模块级预编译，避免每次 deploy 重新编译正则）
+_BRANCH_NAME_RE = re.compile(r"[\w./\-]+")
 
 
 
 def run(env: str = "dev") -> None:
     """执行 deploy 命令的核心逻辑
-    
+
     Args:
         env: 目标部署环境 (dev/test/prod)
     """
 
-    console = Console()
     git_ops = GitOps()
-    config_ops = ConfigOps()
-    
+    config_ops = get_config_ops()
+
 
     try:
         # ========== 1. 检查是否有未提交的更改 ==========
         console.print("[bold cyan]🛡️  正在检查是否有未提交的更改...[/]")
-        
+
+        # 当前分支只查询一次，后面构建远程命令时复用
+        current_branch = git_ops.get_current_branch()
+
         if git_ops.is_dirty():
-            current_branch = git_ops.get_current_branch()
+            # 只有工作区脏时才需要交互确认，把 rich.prompt 的导入成本
+            # 留在这个低频分支里
+            from rich.prompt import Confirm
+
             push = Confirm.ask(f"当前分支 [{current_branch}] 有未提交的更改，现在是否提交？", default=True)
             if push:
                 try:
@@ -66,12 +74,14 @@ def run(env: str = "dev") -> None:
             console.print("[dim]请填写必要信息[/]")
             return
         
-        # 2.3. 获取部署环境配置
-        server_host = config_ops.get_config_value(f"server.host")
-        server_user = config_ops.get_config_value(f"server.user")
-        server_port = config_ops.get_config_value(f"server.port")
-        server_repo_path = config_ops.get_config_value(f"server.repo_path")
-        server_cicd_runner_exec = config_ops.get_config_value(f"server.runner_exec")
+        # 2.3. 获取部署环境配置（一次性加载，避免逐键重复解析）
+        config = config_ops.load_config()
+        server = config["server"]
+        server_host = server["host"]
+        server_user = server["user"]
+        server_port = server.get("port", 22)
+        server_repo_path = server["repo_path"]
+        server_cicd_runner_exec = server.get("runner_exec")
 
         
         console.print(f"[green]✓[/] 配置加载成功 (环境: {env})")
@@ -81,25 +91,41 @@ def run(env: str = "dev") -> None:
         
         
         # ========== 3. 远程服务端部署 ==========
-        # 3.1. 创建 SSHOps 实例
-        ssh_ops = SSHOps(host=server_host, user=server_user, port=server_port)
+        # 3.1. 前置校验：环境必须在配置中定义，分支名不能带 shell 特殊字符
+        environments = config.get("environments", {})
+        if env not in environments:
+            console.print(f"[bold red]❌ 配置文件中未定义环境: '{env}'[/]")
+            console.print(f"[dim]可用环境: {', '.join(environments.keys())}[/]")
+            return
 
-        # 3.2. 构建远程命令
-        current_branch = git_ops.get_current_branch()
-        remote_command = f"{server_cicd_runner_exec} deploy --path {server_repo_path} --env {env} --branch {current_branch} "
+        if not _BRANCH_NAME_RE.fullmatch(current_branch):
+            console.print(f"[bold red]❌ 分支名称不合法: '{current_branch}'[/]")
+            console.print("[dim]分支名只能包含字母、数字、下划线、点、斜杠和连字符[/]")
+            return
+
+        # 3.2. 构建远程命令（shlex.join 保证参数在远端 shell 中不被二次拆分）
+        remote_command = shlex.join([
+            str(server_cicd_runner_exec), "deploy",
+            "--path", str(server_repo_path),
+            "--env", env,
+            "--branch", current_branch,
+        ])
         console.print(f"[dim]执行命令: {remote_command}[/]\n")
-        
-        # 3.3. 执行远程命令
+
+        # 3.3. 建立 SSH 连接并执行远程命令
+        # with 语句维持一条复用连接，后续新增的远程步骤不必重复握手
         try:
-            result = ssh_ops.run_remote_command(command=remote_command)
-            
+            with SSHOps(host=server_host, user=server_user,
+                        port=server_port) as ssh_ops:
+                result = ssh_ops.run_remote_command(command=remote_command)
+
             # 显示远程执行结果
             if result:
                 console.print("[bold green]📥 服务器响应:[/]")
                 console.print(result)
-            
+
             console.print("\n[bold green]✅ 部署指令已发送！[/]")
-            
+
         except RuntimeError as e:
             console.print("[bold red]❌ 远程命令执行失败:[/]")
             console.print(f"   {e}", highlight=False, markup=False)
@@ -1,104 +1,138 @@
-from rich.console import Console
-from rich.prompt import Prompt, Confirm
+from InquirerPy import prompt
 
-from cicd.common.config_ops import ConfigOps
+from cicd.common.config_ops import get_config_ops
+from cicd.common.console import console
 from cicd.common.git_ops import GitOps
 
 
-# 工具声明
-console = Console()         # 日志工具
-git_ops = GitOps()          # Git 操作工具
-config_ops = ConfigOps()    # 配置文件操作工具
-
-
-
 def run():
     """初始化项目
-    
+
     检查流程：
     1. 检查是否为 Git 仓库
     2. 检查配置文件是否存在（不存在则提示创建）
     3. 两者都满足后提示用户执行 preparedev 命令
     """
+    # 工具在真正执行命令时才构造，import 本模块不做任何实际工作
+    git_ops = GitOps()          # Git 操作工具
+    config_ops = get_config_ops()    # 配置文件操作工具（进程内共享实例）
+
     console.print("[bold blue]📦 正在进行就绪检测...[/]")
 
-    # 1. 检查本地 Git 仓库
-    if not git_ops.is_repo():
-        console.print("[yellow]⚠️  当前目录不是 Git 仓库。[/]")
-        
-        if Confirm.ask("是否在此目录初始化 Git 仓库?", default=True):
-            try:
-                git_ops.init()
-                console.print("[green]✓[/] Git 仓库初始化成功")
-            except Exception as e:
-                console.print(f"[red]❌ 初始化失败: {e}[/]")
-                return
-        else:
+    # ==========================================
+    # 1. 预先收集仓库状态，所有问题一次性批量询问
+    #    （单次 prompt 调用，避免多轮终端往返重绘）
+    # ==========================================
+    is_repo = git_ops.is_repo()
+    has_remote = git_ops.has_remote()
+    has_config = config_ops.has_config()
+    if is_repo:
+        # 已是仓库：有代码文件但没有任何提交历史时需要对齐
+        needs_align = not git_ops.get_head_hash() and git_ops.is_dirty()
+    else:
+        # 仓库尚未创建：init 之后若目录里已有文件，同样需要对齐历史
+        needs_align = any(
+            p.name != ".git" for p in git_ops.work_dir.iterdir()
+        )
+
+    def _proceeding(answers) -> bool:
+        """前置条件满足：已是(或同意创建)仓库，且已关联(或同意关联)远程"""
+        return ((is_repo or answers.get("init_git", False))
+                and (has_remote or answers.get("setup_remote", False)))
+
+    questions = [
+        {
+            "type": "confirm", "name": "init_git", "default": True,
+            "message": "当前目录不是 Git 仓库，是否在此目录初始化?",
+            "when": lambda a: not is_repo,
+        },
+        {
+            "type": "confirm", "name": "setup_remote", "default": True,
+            "message": "必须关联远程仓库才能继续，是否现在关联?",
+            "when": lambda a: not has_remote
+                              and (is_repo or a.get("init_git", False)),
+        },
+        {
+            "type": "input", "name": "remote_url",
+            "message": "请输入远程仓库 URL:",
+            "when": lambda a: a.get("setup_remote", False),
+        },
+        {
+            "type": "confirm", "name": "align", "default": True,
+            "message": "检测到本地有代码但尚未建立提交历史，是否自动同步远程历史 (推荐)?",
+            "when": lambda a: needs_align and _proceeding(a),
+        },
+        {
+            "type": "confirm", "name": "create_config", "default": True,
+            "message": f"未找到配置文件 {config_ops.config_name}，是否创建默认配置文件?",
+            "when": lambda a: not has_config and _proceeding(a),
+        },
+    ]
+    answers = prompt(questions)
+
+    # ==========================================
+    # 2. 根据回答依次执行动作
+    # ==========================================
+
+    # 2.1 本地 Git 仓库
+    if not is_repo:
+        if not answers.get("init_git"):
             console.print("[red]❌ 必须在 Git 仓库下运行。程序退出。[/]")
             console.print("[dim]提示: 请先使用 'git init' 初始化仓库。[/]")
             return
+        try:
+            git_ops.init()
+            console.print("[green]✓[/] Git 仓库初始化成功")
+        except Exception as e:
+            console.print(f"[red]❌ 初始化失败: {e}[/]")
+            return
     else:
         console.print("[green]✓[/] Git 仓库检查通过")
 
-
-    # 2. 远程仓库关联检查
-    if not git_ops.has_remote():
-        console.print("[yellow]⚠️  当前仓库未关联远程仓库 (Remote)。[/]")
-        
-        if Confirm.ask("必须关联远程仓库才能继续，是否现在关联?", default=True):
-            try:
-                remote_url = Prompt.ask("请输入远程仓库 URL")
-                if not remote_url:
-                    console.print("[red]❌ URL 不能为空。程序退出。[/]")
-                    return
-                
-                git_ops.add_remote(remote_url)
-                console.print("[green]✓[/] 远程仓库关联成功")
-            except Exception as e:
-                console.print(f"[red]❌ 关联远程仓库失败: {e}[/]")
-                return
-        else:
+    # 2.2 远程仓库关联
+    if not has_remote:
+        if not answers.get("setup_remote"):
             console.print("[red]❌ 未关联远程仓库，无法进行后续部署检查。程序退出。[/]")
             return
+        remote_url = (answers.get("remote_url") or "").strip()
+        if not remote_url:
+            console.print("[red]❌ URL 不能为空。程序退出。[/]")
+            return
+        try:
+            git_ops.add_remote(remote_url)
+            console.print("[green]✓[/] 远程仓库关联成功")
+        except Exception as e:
+            console.print(f"[red]❌ 关联远程仓库失败: {e}[/]")
+            return
     else:
         console.print("[green]✓[/] 远程仓库检查通过")
 
-    # 3. 检查是否有 git 提交历史（适用于首次初始化项目 或 zip下载代码的情况）
-    if not git_ops.get_head_hash() and git_ops.is_dirty():
-        console.print("\n[yellow]⚠️  检测到本地有代码文件，但尚未建立 Git 提交历史。[/]")
-                    
-        if Confirm.ask("是否自动同步远程历史 (推荐)?", default=True):
-            try:
-                with console.status("[bold green]正在对齐远程历史...[/]"):
-                    result_msg = git_ops.align_with_remote()
-                    console.print(f"[green]✓[/] {result_msg}")
-            except Exception as e:
-                console.print(f"[red]❌ 同步失败 (请检查远程分支是否存在): {e}[/]")
-                return
-            
-    
-    # 2. 检查配置文件
-    if not config_ops.has_config():
-        console.print(f"[yellow]⚠️  未找到配置文件: {config_ops.config_name}[/]")
-        
-        # 提示用户是否创建
-        create = Confirm.ask("是否创建默认配置文件?", default=True)
-        
-        if create:
-            try:
-                config_path = config_ops.create_default_config()
-                console.print(f"[green]✓[/] 配置文件已创建: {config_path}")
-                console.print("[dim]请根据项目需求编辑配置文件后再继续。[/]")
-                return
-            except Exception as e:
-                console.print(f"[red]❌ 创建配置文件失败: {e}[/]")
-                return
-        else:
+    # 2.3 对齐远程历史（适用于首次初始化项目 或 zip下载代码的情况）
+    if needs_align and answers.get("align"):
+        try:
+            with console.status("[bold green]正在对齐远程历史...[/]"):
+                result_msg = git_ops.align_with_remote()
+                console.print(f"[green]✓[/] {result_msg}")
+        except Exception as e:
+            console.print(f"[red]❌ 同步失败 (请检查远程分支是否存在): {e}[/]")
+            return
+
+    # 2.4 配置文件
+    if not has_config:
+        if not answers.get("create_config"):
             console.print("[yellow]已取消初始化。[/]")
             return
+        try:
+            config_path = config_ops.create_default_config()
+            console.print(f"[green]✓[/] 配置文件已创建: {config_path}")
+            console.print("[dim]请根据项目需求编辑配置文件后再继续。[/]")
+            return
+        except Exception as e:
+            console.print(f"[red]❌ 创建配置文件失败: {e}[/]")
+            return
     else:
         console.print(f"[green]✓[/] 配置文件已存在: {config_ops.config_name}")
-        
+
         # 验证配置文件
         is_valid, errors = config_ops.validate_config()
         if not is_valid:
@@ -114,5 +148,5 @@ def run():
     console.print("   [dim]$ git add .[/]")
     console.print("   [dim]$ git commit -m 'Initial commit'[/]")
     console.print("   [dim]$ git push -u origin main[/]")
-    
-    console.print("\n👉 然后执行 [bold cyan]cicd preparedev[/] 开始开发")
\ No newline at end of file
+
+    console.print("\n👉 然后执行 [bold cyan]cicd preparedev[/] 开始开发")
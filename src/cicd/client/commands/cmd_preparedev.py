@@ -1,21 +1,20 @@
 """preparedev 命令实现：环境同步与分支创建"""
-from rich.console import Console
 from InquirerPy import inquirer
 from InquirerPy.validator import EmptyInputValidator
 
+from cicd.common.console import console
 from cicd.common.git_ops import GitOps
 
 
-console = Console()
-git_ops = GitOps()
-
-
 def run(base_branch: str = "main") -> None:
     """执行 preparedev 命令的核心逻辑
-    
+
     Args:
         base_branch: 基准分支名称，默认为 main
     """
+    # 工具在真正执行命令时才构造，import 本模块不做任何实际工作
+    git_ops = GitOps()
+
     try:
         # 1. 脏检查：确保工作区干净
         console.print("[bold cyan]🔍 检查工作区状态...[/]")
@@ -30,18 +29,10 @@ def run(base_branch: str = "main") -> None:
         console.print(f"[bold cyan]🔄 正在同步 [yellow]{base_branch}[/] 分支...[/]")
         
         try:
-            # 切换到基准分支
-            git_ops.checkout(base_branch)
-            console.print(f"[green]✓[/] 已切换到 {base_branch}")
-            
-            # 拉取最新代码
-            git_ops.pull("origin", base_branch)
-            console.print(f"[green]✓[/] 已拉取最新代码")
-            
-            # 获取远程分支信息
-            git_ops.fetch("origin")
-            console.print(f"[green]✓[/] 已同步远程分支信息\n")
-            
+            # fetch + 切换 + 快进合并一次完成（单个 git 进程链）
+            git_ops.sync_base(base_branch)
+            console.print(f"[green]✓[/] 已切换到 {base_branch} 并同步最新代码\n")
+
         except RuntimeError as e:
             console.print(f"[bold red]❌ 同步基准分支失败:[/] {e}", markup=False)
             return
@@ -0,0 +1,54 @@
+"""默认配置文件的预渲染 YAML 文本
+
+把默认配置以字符串常量形式预先写好，`cicd init` 创建配置文件时直接
+写入字节，不需要经过 PyYAML 的 dump；同时字面量里可以带注释，
+生成的 cicd-config.yaml 对用户更友好（dump 出来的 YAML 没有注释）。
+
+注意：修改默认配置时只需改这里，`ConfigOps.DEFAULT_CONFIG_TEMPLATE`
+会从本字符串惰性解析得到。
+"""
+
+DEFAULT = """\
+# 项目名称
+project_name: your-project-name
+
+# 服务器基础配置 (所有环境共用)
+server:
+  host: your-server-ip              # 目标服务器 IP
+  user: your-ssh-username           # SSH 用户名
+  repo_path: /data/repos/your-project  # 源码拉取目录
+  port: 22                          # 可选：默认 22
+  key_file: ~/.ssh/id_rsa           # 可选：指定私钥路径
+  # 场景 A: 标准 venv (指向具体的可执行文件)
+  runner_exec: /home/jscn/cicd-test/cicd-tool/.venv/bin/cicd-runner
+  # 场景 B: Conda 环境
+  # runner_exec: /home/jscn/miniconda3/envs/cicd/bin/cicd-runner
+  # 场景 C: 全局安装 (在 PATH 中)
+  # runner_exec: cicd-runner
+
+# 环境定义
+environments:
+  # 场景 A: 生产环境 (前端项目示例 - 构建并搬运)
+  prod:
+    deploy_path: /apps/your-project/   # 最终产物目录 (Nginx Root)
+    steps:
+    - npm install
+    - npm run build:prod
+    - rm -rf {deploy_path}/*
+    - cp -r dist/* {deploy_path}
+    - action: nginx
+
+  # 场景 B: 测试环境 (原地构建示例)
+  test:
+    deploy_path: /data/repos/your-project/dist
+    steps:
+    - npm install
+    - npm run build:test
+
+  # 场景 C: 开发环境
+  dev:
+    deploy_path: /data/repos/your-project/dist
+    steps:
+    - npm install
+    - npm run build:dev
+"""
@@ -1,8 +1,39 @@
 """配置管理工具类"""
+import hashlib
+import json
+import os
+import stat as stat_module
+import time
 import yaml
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+# 优先使用 libyaml 的 C 实现（解析/序列化比纯 Python 实现快 5-10 倍），
+# PyYAML 未编译 C 扩展时退回纯 Python 实现，行为一致
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+from cicd.common._default_config_yaml import DEFAULT as _DEFAULT_CONFIG_YAML
+
+
+class _LazyDefaultTemplate:
+    """DEFAULT_CONFIG_TEMPLATE 的惰性求值描述符
+
+    默认配置以预渲染的 YAML 字符串形式存放（见 _default_config_yaml.py），
+    创建配置文件只写字节；只有当有代码真正访问模板字典时才解析一次。
+    """
+
+    _parsed: Optional[Dict[str, Any]] = None
+
+    def __get__(self, obj, objtype=None) -> Dict[str, Any]:
+        if _LazyDefaultTemplate._parsed is None:
+            _LazyDefaultTemplate._parsed = yaml.load(
+                _DEFAULT_CONFIG_YAML, Loader=SafeLoader
+            )
+        return _LazyDefaultTemplate._parsed
+
 
 class ConfigOps:
     """配置文件管理工具类
@@ -11,61 +42,17 @@ class ConfigOps:
     """
     
     DEFAULT_CONFIG_NAME = "cicd-config.yaml"
+
+    # stat() 结果缓存的有效期（秒）：一条命令内的连环检查共享一次 stat，
+    # 常驻进程仍能在人可感知的时间窗内看到外部修改
+    _STAT_TTL = 0.1
+
+    # 校验用的必填键集合（类级常量，避免每次校验重新构造列表）
+    _REQUIRED_TOP_KEYS = frozenset({"project_name", "server", "environments"})
+    _REQUIRED_SERVER_FIELDS = frozenset({"host", "user", "repo_path"})
     
-    DEFAULT_CONFIG_TEMPLATE = {
-        # 项目名称
-        "project_name": "your-project-name",
-
-        # 服务器基础配置 (所有环境共用)
-        "server": {
-            "host": "your-server-ip",     # 目标服务器 IP
-            "user": "your-ssh-username",              # SSH 用户名
-            "repo_path": "/data/repos/your-project", # 源码拉取目录
-            "port": 22,                # 可选：默认 22
-            "key_file": "~/.ssh/id_rsa", # 可选：指定私钥路径
-            # 场景 A: 标准 venv (指向具体的可执行文件)
-            "runner_exec": "/home/jscn/cicd-test/cicd-tool/.venv/bin/cicd-runner"
-            
-            # 场景 B: Conda 环境
-            # runner_exec: "/home/jscn/miniconda3/envs/cicd/bin/cicd-runner"
-            
-            # 场景 C: 全局安装 (在 PATH 中)
-            # runner_exec: "cicd-runner"
-        },
-
-        # 环境定义
-        "environments": {
-            # 场景 A: 生产环境 (前端项目示例 - 构建并搬运)
-            "prod": {
-                "deploy_path": "/apps/your-project/", # 最终产物目录 (Nginx Root)
-                "steps": [
-                    "npm install",
-                    "npm run build:prod",
-                    "rm -rf {deploy_path}/*",
-                    "cp -r dist/* {deploy_path}",
-                    {"action": "nginx"}
-                ]
-            },
-
-            # 场景 B: 测试环境 (原地构建示例)
-            "test": {
-                "deploy_path": "/data/repos/your-project/dist",
-                "steps": [
-                    "npm install",
-                    "npm run build:test"
-                ]
-            },
-
-            # 场景 C: 开发环境
-            "dev": {
-                "deploy_path": "/data/repos/your-project/dist",
-                "steps": [
-                    "npm install",
-                    "npm run build:dev"
-                ]
-            }
-        }
-    }
+    # 默认配置模板字典（从预渲染的 YAML 字符串惰性解析）
+    DEFAULT_CONFIG_TEMPLATE = _LazyDefaultTemplate()
     
     def __init__(self, work_dir: Optional[str] = None, 
                  config_name: Optional[str] = None):
@@ -78,6 +65,52 @@ class ConfigOps:
         self.work_dir = Path(work_dir).resolve() if work_dir else Path.cwd()
         self.config_name = config_name or self.DEFAULT_CONFIG_NAME
         self.config_path = self.work_dir / self.config_name
+        # JSON 快路径缓存文件（json 解析比 YAML 快一个数量级）。
+        # 必须放在工作区之外：落在工作区里会污染 git status，
+        # 还会被 push()/align_with_remote() 的 add . 提交进用户仓库
+        git_dir = self.work_dir / ".git"
+        if git_dir.is_dir():
+            # 仓库场景：.git 目录天然不受版本控制
+            self._json_cache_path = (
+                git_dir / f"{self.config_path.stem}.cache.json"
+            )
+        else:
+            # 非仓库场景：退到用户缓存目录，用配置路径的摘要区分项目
+            cache_root = Path(
+                os.environ.get("XDG_CACHE_HOME")
+                or Path.home() / ".cache"
+            ) / "cicd"
+            digest = hashlib.sha1(
+                str(self.config_path).encode("utf-8")
+            ).hexdigest()[:16]
+            self._json_cache_path = cache_root / f"{digest}.cache.json"
+        # 解析结果缓存：避免同一进程内重复读盘 + 重复 YAML 解析
+        # 以文件 mtime 作为失效依据，文件被外部修改后会自动重新加载
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_mtime: Optional[float] = None
+        # 校验结果缓存：同一份文件内容只做一次完整性检查
+        self._validation_cache: Optional[tuple] = None
+        self._validation_mtime: Optional[float] = None
+        # stat() 结果缓存: (stat_result 或 None, 采样时刻)
+        self._stat_cache: Optional[tuple] = None
+
+    def _stat(self):
+        """获取 config_path 的 stat 结果（带短 TTL 缓存）
+
+        Returns:
+            os.stat_result；文件不存在时返回 None
+        """
+        now = time.monotonic()
+        if (self._stat_cache is not None
+                and now - self._stat_cache[1] < self._STAT_TTL):
+            return self._stat_cache[0]
+
+        try:
+            st = self.config_path.stat()
+        except OSError:
+            st = None
+        self._stat_cache = (st, now)
+        return st
     
     def has_config(self) -> bool:
         """检查配置文件是否存在
@@ -85,7 +118,9 @@ class ConfigOps:
         Returns:
             如果配置文件存在返回 True，否则返回 False
         """
-        return self.config_path.exists() and self.config_path.is_file()
+        # 复用带 TTL 的 stat 缓存，连环检查只触发一次系统调用
+        st = self._stat()
+        return st is not None and stat_module.S_ISREG(st.st_mode)
     
     def create_default_config(self, overwrite: bool = False) -> Path:
         """创建默认配置文件
@@ -107,17 +142,18 @@ class ConfigOps:
         
         # 确保目录存在
         self.work_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 写入默认配置
+
+        # 写入默认配置（模板是常量，序列化结果已在模块加载时算好）
         with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(
-                self.DEFAULT_CONFIG_TEMPLATE,
-                f,
-                allow_unicode=True,
-                default_flow_style=False,
-                sort_keys=False
-            )
-        
+            f.write(_DEFAULT_CONFIG_YAML)
+
+        # 文件内容已变化，清空解析、校验与 stat 缓存
+        self._cache = None
+        self._cache_mtime = None
+        self._validation_cache = None
+        self._validation_mtime = None
+        self._stat_cache = None
+
         return self.config_path
     
     def load_config(self) -> Dict[str, Any]:
@@ -130,16 +166,63 @@ class ConfigOps:
             FileNotFoundError: 当配置文件不存在时
             yaml.YAMLError: 当配置文件格式错误时
         """
-        if not self.has_config():
+        st = self._stat()
+        if st is None:
             raise FileNotFoundError(
                 f"配置文件不存在: {self.config_path}。"
                 "请先使用 create_default_config() 创建配置文件。"
             )
-        
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        
+
+        # 命中缓存且文件未被修改时，直接返回上次的解析结果
+        if self._cache is not None and st.st_mtime == self._cache_mtime:
+            return self._cache
+
+        # JSON 快路径：sidecar 不早于 YAML 时直接用 json 解析
+        config = self._load_json_cache(st)
+        if config is None:
+            try:
+                with open(self.config_path, 'r', encoding='utf-8') as f:
+                    config = yaml.load(f, Loader=SafeLoader)
+            except (FileNotFoundError, IsADirectoryError):
+                raise FileNotFoundError(
+                    f"配置文件不存在: {self.config_path}。"
+                    "请先使用 create_default_config() 创建配置文件。"
+                )
+            self._write_json_cache(config)
+
+        self._cache = config
+        self._cache_mtime = st.st_mtime
         return config
+
+    def _load_json_cache(self, yaml_stat) -> Optional[Dict[str, Any]]:
+        """尝试从 JSON sidecar 读取配置（快路径）
+
+        sidecar 的 mtime 早于 YAML 文件时视为过期；任何读取/解析
+        失败都静默退回 YAML 解析路径。
+        """
+        try:
+            cache_stat = self._json_cache_path.stat()
+            if cache_stat.st_mtime_ns >= yaml_stat.st_mtime_ns:
+                return json.loads(self._json_cache_path.read_bytes())
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _write_json_cache(self, config: Dict[str, Any]) -> None:
+        """把解析结果写入 JSON sidecar（尽力而为，失败不影响主流程）
+
+        先写临时文件再 os.replace，保证并发读取方看不到半成品。
+        """
+        try:
+            # 缓存目录（.git/ 或 ~/.cache/cicd/）可能尚不存在
+            self._json_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._json_cache_path.with_suffix(".json.tmp")
+            tmp_path.write_text(
+                json.dumps(config, ensure_ascii=False), encoding='utf-8'
+            )
+            os.replace(tmp_path, self._json_cache_path)
+        except (OSError, TypeError, ValueError):
+            pass
     
     def save_config(self, config: Dict[str, Any]) -> None:
         """保存配置到文件
@@ -151,11 +234,22 @@ class ConfigOps:
             yaml.dump(
                 config,
                 f,
+                Dumper=SafeDumper,
                 allow_unicode=True,
                 default_flow_style=False,
                 sort_keys=False
             )
-    
+
+        # 写入成功后缓存与磁盘内容一致，直接回填（写穿透）而非作废，
+        # 紧随其后的 load_config 不需要重新解析
+        self._stat_cache = None
+        st = self._stat()
+        self._cache = config
+        self._cache_mtime = st.st_mtime if st is not None else None
+        # 内容已变化，校验结果需要重新计算
+        self._validation_cache = None
+        self._validation_mtime = None
+
     def update_config(self, updates: Dict[str, Any]) -> Dict[str, Any]:
         """更新配置文件（部分更新）
         
@@ -180,11 +274,15 @@ class ConfigOps:
             base: 基础字典
             updates: 更新字典
         """
-        for key, value in updates.items():
-            if isinstance(value, dict) and key in base and isinstance(base[key], dict):
-                self._deep_update(base[key], value)
-            else:
-                base[key] = value
+        # 用显式栈代替递归，省去深层嵌套时的 Python 函数调用开销
+        stack = [(base, updates)]
+        while stack:
+            b, u = stack.pop()
+            for key, value in u.items():
+                if isinstance(value, dict) and isinstance(b.get(key), dict):
+                    stack.append((b[key], value))
+                else:
+                    b[key] = value
     
     def get_config_value(self, key_path: str, default: Any = None) -> Any:
         """获取配置值（支持点号路径）
@@ -218,25 +316,34 @@ class ConfigOps:
         Returns:
             (是否有效, 错误信息列表)
         """
-        if not self.has_config():
-            return False, ["配置文件不存在"]
-        
+        # 文件未被修改时直接复用上次的校验结果
+        st = self._stat()
+        mtime = st.st_mtime if st is not None else None
+
+        if (mtime is not None and self._validation_cache is not None
+                and mtime == self._validation_mtime):
+            return self._validation_cache
+
         try:
             config = self.load_config()
+        except FileNotFoundError:
+            return False, ["配置文件不存在"]
         except yaml.YAMLError as e:
             return False, [f"配置文件格式错误: {e}"]
         
         errors = []
         
         # 1. 检查顶级必需键
-        # 新版: ["project_name", "server", "environments"]
-        required_top_keys = ["project_name", "server", "environments"]
-        for key in required_top_keys:
-            if key not in config:
-                errors.append(f"缺少必需的顶级配置节: {key}")
+        # 新版: {"project_name", "server", "environments"}
+        missing_top = self._REQUIRED_TOP_KEYS - config.keys()
+        errors.extend(
+            f"缺少必需的顶级配置节: {key}" for key in sorted(missing_top)
+        )
         
         # 如果顶级配置缺失，后续检查可能会报错，先判断一下
         if errors:
+            self._validation_cache = (False, errors)
+            self._validation_mtime = mtime
             return False, errors
 
         # 2. 检查 server 配置
@@ -247,10 +354,11 @@ class ConfigOps:
             else:
                 # 必填项: host, user, repo_path
                 # 选填项: port, key_file (不做强制检查)
-                req_server_fields = ["host", "user", "repo_path"]
-                for field in req_server_fields:
-                    if field not in server:
-                        errors.append(f"server 配置缺少必需项: {field}")
+                missing_server = self._REQUIRED_SERVER_FIELDS - server.keys()
+                errors.extend(
+                    f"server 配置缺少必需项: {field}"
+                    for field in sorted(missing_server)
+                )
 
         # 3. 检查 environments 配置
         if "environments" in config:
@@ -283,14 +391,54 @@ class ConfigOps:
                             errors.append(f"环境 '{env_name}' 的 steps 必须是一个列表")
                         else:
                             # 3.3 检查 steps 里的每一项格式
-                            for i, step in enumerate(steps):
-                                # step 必须是 字符串 (Shell命令) 或 字典 (Action)
+                            # step 必须是 字符串 (Shell命令)、字典 (Action)
+                            # 或 列表 (并行子步骤组)；列表展开后按相同规则检查
+                            pending = [
+                                (f"第 {i+1} 个步骤", step)
+                                for i, step in enumerate(steps)
+                            ]
+                            while pending:
+                                label, step = pending.pop()
                                 if isinstance(step, str):
                                     continue
                                 elif isinstance(step, dict):
                                     if "action" not in step:
-                                        errors.append(f"环境 '{env_name}' 的第 {i+1} 个步骤是字典，但缺少 'action' 键")
+                                        errors.append(f"环境 '{env_name}' 的{label}是字典，但缺少 'action' 键")
+                                elif isinstance(step, list):
+                                    pending.extend(
+                                        (f"{label}的并行子步骤 {j+1}", sub)
+                                        for j, sub in enumerate(step)
+                                    )
                                 else:
-                                    errors.append(f"环境 '{env_name}' 的第 {i+1} 个步骤格式无效 (必须是字符串或 Action 对象)")
+                                    errors.append(f"环境 '{env_name}' 的{label}格式无效 (必须是字符串、Action 对象或并行列表)")
 
-        return len(errors) == 0, errors
+        self._validation_cache = (len(errors) == 0, errors)
+        self._validation_mtime = mtime
+        return self._validation_cache
+
+
+# 进程内共享的 ConfigOps 实例（按工作目录 + 配置名缓存）。
+# 各命令通过 get_config_ops() 拿同一个实例，解析/校验/stat 缓存
+# 才能真正跨调用点生效，而不是每个命令各养一份冷缓存
+_shared_instances: Dict[tuple, ConfigOps] = {}
+
+
+def get_config_ops(work_dir: Optional[str] = None,
+                   config_name: Optional[str] = None) -> ConfigOps:
+    """获取共享的 ConfigOps 实例
+
+    Args:
+        work_dir: 工作目录路径，默认为当前目录
+        config_name: 配置文件名称，默认为 cicd-config.yaml
+
+    Returns:
+        对应 (工作目录, 配置名) 的共享实例
+    """
+    resolved = Path(work_dir).resolve() if work_dir else Path.cwd()
+    key = (resolved, config_name or ConfigOps.DEFAULT_CONFIG_NAME)
+    ops = _shared_instances.get(key)
+    if ops is None:
+        ops = _shared_instances[key] = ConfigOps(
+            work_dir=str(resolved), config_name=config_name
+        )
+    return ops
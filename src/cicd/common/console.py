@@ -0,0 +1,8 @@
+"""共享的 rich Console 实例
+
+每个 Console() 构造都会重新探测终端能力（isatty、终端尺寸、颜色系统、
+环境变量）。全进程共用这一个实例，探测只发生一次。
+"""
+from rich.console import Console
+
+console = Console()
@@ -1,8 +1,17 @@
 """Git 操作工具类"""
+import shlex
 import subprocess
 from pathlib import Path
 from typing import Optional
 
+# 可选加速后端：pygit2 (libgit2) 可以在进程内完成只读查询，
+# 免去每次 fork+exec git 的开销（单次查询从几十毫秒降到亚毫秒级）。
+# 未安装时自动退回 subprocess 实现，行为不变。
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 
 class GitOps:
     """Git 操作工具类
@@ -17,16 +26,113 @@ class GitOps:
             work_dir: 工作目录路径，默认为当前目录
         """
         self.work_dir = Path(work_dir).resolve() if work_dir else Path.cwd()
-    
-    def run(self, args: list[str]) -> str:
+        # 只读查询结果缓存（当前分支、HEAD、remote 等），
+        # 避免同一进程内重复 fork git 子进程；任何变更类操作后整体失效
+        self._query_cache: dict = {}
+        # is_repo() 结果缓存：几乎所有公开方法入口都要做这项检查，
+        # 目录是否为仓库在进程生命周期内基本不变（init 除外）
+        self._is_repo_cached: Optional[bool] = None
+        # pygit2 仓库句柄（惰性打开）；False 表示已尝试过且不可用
+        self._pygit2_handle = None
+        # 常驻的 git cat-file --batch-check 辅助进程（惰性启动），
+        # 把"revision → 对象哈希"查询从一次 fork+exec 降为一次管道往返
+        self._batch_check_proc: Optional[subprocess.Popen] = None
+
+    def _invalidate_query_cache(self) -> None:
+        """清空只读查询缓存（在 checkout/pull/push 等变更操作后调用）"""
+        self._query_cache.clear()
+
+    def _pygit2_repo(self):
+        """获取 pygit2 仓库句柄
+
+        Returns:
+            pygit2.Repository 实例；pygit2 未安装或目录不是仓库时返回 None
+        """
+        if pygit2 is None:
+            return None
+        if self._pygit2_handle is None:
+            try:
+                # 与 git 一致：从 work_dir 向上逐级查找仓库
+                found = pygit2.discover_repository(str(self.work_dir))
+                self._pygit2_handle = (
+                    pygit2.Repository(found) if found else False
+                )
+            except Exception:
+                self._pygit2_handle = False
+        return self._pygit2_handle or None
+
+    def _batch_check(self, rev: str) -> Optional[str]:
+        """通过常驻 cat-file 进程把 revision 解析为对象哈希
+
+        辅助进程在首次调用时启动，之后每次查询只是一次管道
+        写入 + 读取，没有新的进程开销。
+
+        Args:
+            rev: 任意 revision 表达式（如 "HEAD"）
+
+        Returns:
+            完整对象哈希；revision 不存在时返回 ""；
+            辅助进程不可用时返回 None（调用方应回退到 subprocess）
+        """
+        proc = self._batch_check_proc
+        if proc is None or proc.poll() is not None:
+            try:
+                proc = subprocess.Popen(
+                    ["git", "cat-file",
+                     "--batch-check=%(objectname) %(objecttype)"],
+                    cwd=self.work_dir,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True
+                )
+            except OSError:
+                return None
+            self._batch_check_proc = proc
+
+        try:
+            proc.stdin.write(rev + "\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline().strip()
+        except (BrokenPipeError, OSError, ValueError):
+            self.close()
+            return None
+
+        if not line:
+            self.close()
+            return None
+        if line.endswith((" missing", " ambiguous")):
+            return ""
+        return line.partition(" ")[0]
+
+    def close(self) -> None:
+        """关闭常驻辅助进程（可重复调用）"""
+        proc = self._batch_check_proc
+        if proc is None:
+            return
+        self._batch_check_proc = None
+        try:
+            proc.stdin.close()
+            proc.terminate()
+            proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired, ValueError):
+            pass
+
+    def __del__(self):
+        self.close()
+
+    def run(self, args: list[str], stream: bool = False) -> str:
         """执行 git 命令核心封装
-        
+
         Args:
             args: git 命令参数列表
-            
+            stream: 为 True 时 stdout 直通终端，不在内存里缓冲
+                （适合 fetch/pull 等输出量大的网络命令）；
+                stderr 仍被捕获用于错误报告
+
         Returns:
-            命令输出结果
-            
+            命令输出结果（stream=True 时返回空字符串）
+
         Raises:
             RuntimeError: 当 git 命令执行失败时
         """
@@ -34,25 +140,63 @@ class GitOps:
             res = subprocess.run(
                 ["git"] + args,
                 cwd=self.work_dir,
-                capture_output=True,
+                stdout=None if stream else subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
                 check=True
             )
-            return res.stdout.strip()
+            return "" if stream else res.stdout.strip()
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Git execution failed: {e.stderr.strip()}")
-    
+
+    def run_batch(self, cmds: list[list[str]], stream: bool = False) -> str:
+        """用 && 串联多条 git 命令，在一次 shell 进程里执行
+
+        多条顺序依赖的 git 命令只支付一次 fork+exec 开销；任何一条
+        失败都会中断后续命令。
+
+        Args:
+            cmds: 每条命令的参数列表（不含 "git" 本身）
+            stream: 同 run()，stdout 直通终端而不缓冲
+
+        Returns:
+            最后一条命令的标准输出（stream=True 时返回空字符串）
+
+        Raises:
+            RuntimeError: 当任意一条 git 命令执行失败时
+        """
+        script = " && ".join("git " + shlex.join(args) for args in cmds)
+        try:
+            res = subprocess.run(
+                script,
+                shell=True,
+                cwd=self.work_dir,
+                stdout=None if stream else subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True
+            )
+            return "" if stream else res.stdout.strip()
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Git execution failed: {e.stderr.strip()}")
+
     def is_repo(self) -> bool:
         """检查当前目录是否为 Git 仓库
         
         Returns:
             如果是 Git 仓库返回 True，否则返回 False
         """
-        try:
-            self.run(["rev-parse", "--is-inside-work-tree"])
-            return True
-        except RuntimeError:
-            return False
+        if self._is_repo_cached is None:
+            repo = self._pygit2_repo()
+            if repo is not None:
+                self._is_repo_cached = not repo.is_bare
+            else:
+                try:
+                    self.run(["rev-parse", "--is-inside-work-tree"])
+                    self._is_repo_cached = True
+                except RuntimeError:
+                    self._is_repo_cached = False
+        return self._is_repo_cached
     
     def create_and_checkout_branch(self, branch_name: str, 
                                    base_branch: Optional[str] = None) -> None:
@@ -72,15 +216,16 @@ class GitOps:
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
         
-        # 获取本地分支列表
-        branches_output = self.run(["branch", "--list"])
-        local_branches = [
-            line.strip().replace('*', '').strip()
-            for line in branches_output.split('\n')
-            if line.strip()
-        ]
-        
-        if branch_name in local_branches:
+        # 精确探测目标分支是否存在：show-ref 只查一条引用，
+        # 不用列出全部本地分支再逐行解析
+        try:
+            self.run(["show-ref", "--verify", "--quiet",
+                      f"refs/heads/{branch_name}"])
+            branch_exists = True
+        except RuntimeError:
+            branch_exists = False
+
+        if branch_exists:
             # 分支已存在，直接切换
             self.run(["checkout", branch_name])
         else:
@@ -88,9 +233,11 @@ class GitOps:
             if base_branch:
                 # 先切换到基础分支
                 self.run(["checkout", base_branch])
-            
+
             # 创建并切换到新分支
             self.run(["checkout", "-b", branch_name])
+
+        self._invalidate_query_cache()
     
     def get_current_branch(self) -> str:
         """获取当前分支名称
@@ -104,8 +251,26 @@ class GitOps:
         """
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
-        
-        return self.run(["branch", "--show-current"])
+
+        if "current_branch" not in self._query_cache:
+            branch = None
+            repo = self._pygit2_repo()
+            if repo is not None:
+                try:
+                    # 等价于 git branch --show-current（分离 HEAD 时输出为空）
+                    if repo.head_is_detached:
+                        branch = ""
+                    elif repo.head_is_unborn:
+                        target = str(repo.lookup_reference("HEAD").target)
+                        branch = target.removeprefix("refs/heads/")
+                    else:
+                        branch = repo.head.shorthand
+                except Exception:
+                    branch = None
+            if branch is None:
+                branch = self.run(["branch", "--show-current"])
+            self._query_cache["current_branch"] = branch
+        return self._query_cache["current_branch"]
     
     def is_dirty(self) -> bool:
         """检查工作区是否有未提交的更改
@@ -119,9 +284,34 @@ class GitOps:
         """
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
-        
-        output = self.run(["status", "--porcelain"])
-        return bool(output.strip())
+
+        repo = self._pygit2_repo()
+        if repo is not None:
+            try:
+                # 与 status --porcelain 口径一致：含未跟踪文件，不含忽略项
+                return bool(repo.status())
+            except Exception:
+                pass
+
+        # 流式读取：只关心"有没有"改动，读到第一个字节就可以下结论并
+        # 提前终止 git，大仓库不必等全量 status 输出生成完。
+        # 注意不能用 diff --quiet 代替——它看不到未跟踪文件
+        with subprocess.Popen(
+            ["git", "status", "--porcelain", "-z"],
+            cwd=self.work_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as proc:
+            if proc.stdout.read(1):
+                proc.terminate()
+                return True
+            # 读到 EOF：工作区干净或 git 出错，等退出码区分
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(
+                    f"Git execution failed: {stderr.decode().strip()}"
+                )
+        return False
     
     def checkout(self, branch: str) -> None:
         """切换到指定分支
@@ -135,8 +325,9 @@ class GitOps:
         """
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
-        
+
         self.run(["checkout", branch])
+        self._invalidate_query_cache()
     
     def pull(self, remote: str = "origin", branch: Optional[str] = None) -> None:
         """拉取远程代码
@@ -153,9 +344,10 @@ class GitOps:
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
         
         if branch:
-            self.run(["pull", remote, branch])
+            self.run(["pull", remote, branch], stream=True)
         else:
-            self.run(["pull", remote])
+            self.run(["pull", remote], stream=True)
+        self._invalidate_query_cache()
     
     def fetch(self, remote: str = "origin", all_remotes: bool = False) -> None:
         """获取远程仓库信息，确保本地能感知到远程的新分支
@@ -172,10 +364,62 @@ class GitOps:
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
         
         if all_remotes:
-            self.run(["fetch", "--all"])
+            self.run(["fetch", "--all"], stream=True)
         else:
-            self.run(["fetch", remote])
+            self.run(["fetch", remote], stream=True)
     
+    def sync_base(self, base_branch: str, remote: str = "origin") -> None:
+        """同步基准分支：fetch + 切换 + 快进合并
+
+        三步通过 shell 链接在一次进程调用里完成，代替
+        checkout/pull/fetch 三次独立的 git 子进程。
+
+        Args:
+            base_branch: 基准分支名称
+            remote: 远程仓库名称，默认为 origin
+
+        Raises:
+            ValueError: 当不是 Git 仓库时
+            RuntimeError: 当同步失败时（包括本地分支与远程分叉、无法快进）
+        """
+        if not self.is_repo():
+            raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
+
+        try:
+            self.run_batch([
+                ["fetch", "--prune", remote],
+                ["checkout", base_branch],
+                ["merge", "--ff-only", f"{remote}/{base_branch}"],
+            ], stream=True)
+        finally:
+            self._invalidate_query_cache()
+
+    def sync(self, branch: str, remote: str = "origin") -> None:
+        """同步部署分支：fetch + checkout + pull 合并为一次进程调用
+
+        服务端部署用：把仓库切换到目标分支并拉取最新代码，
+        三步在同一个 shell 链里完成。
+
+        Args:
+            branch: 目标分支名称
+            remote: 远程仓库名称，默认为 origin
+
+        Raises:
+            ValueError: 当不是 Git 仓库时
+            RuntimeError: 当同步失败时
+        """
+        if not self.is_repo():
+            raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
+
+        try:
+            self.run_batch([
+                ["fetch", remote],
+                ["checkout", branch],
+                ["pull", remote, branch],
+            ], stream=True)
+        finally:
+            self._invalidate_query_cache()
+
     def push(self, commit_msg: str) -> None:
         """添加、提交并推送代码到远程仓库
         
@@ -188,25 +432,38 @@ class GitOps:
         """
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
-        
-        # 1. git add .
-        self.run(["add", "."])
-        
-        # 2. git commit -m [commit_msg]
-        self.run(["commit", "-m", commit_msg])
-        
-        # 3. git push
-        current_branch = self.get_current_branch()
+
         try:
-            # 尝试普通推送
-            self.run(["push"])
+            # add + commit + push 串联为一次进程调用
+            self.run_batch([
+                ["add", "."],
+                ["commit", "-m", commit_msg],
+                ["push"],
+            ])
         except RuntimeError as e:
-            # 如果是因为没有 upstream 导致的失败，则尝试 set-upstream
+            # 如果是因为没有 upstream 导致的失败，则尝试 set-upstream；
+            # 分支名在失败路径里由 shell 内联求值，仍然只有一个子进程
             if "no upstream branch" in str(e):
-                self.run(["push", "--set-upstream", "origin", current_branch])
+                try:
+                    subprocess.run(
+                        'git push --set-upstream origin '
+                        '"$(git branch --show-current)"',
+                        shell=True,
+                        cwd=self.work_dir,
+                        capture_output=True,
+                        text=True,
+                        check=True
+                    )
+                except subprocess.CalledProcessError as e2:
+                    raise RuntimeError(
+                        f"Git execution failed: {e2.stderr.strip()}"
+                    )
             else:
                 # 其他错误（如冲突）则直接抛出
                 raise e
+        finally:
+            # commit 已改变 HEAD，相关缓存需要失效
+            self._invalidate_query_cache()
     
     def get_current_commit_hash(self, short: bool = True) -> str:
         """获取当前 HEAD 的 Commit Hash
@@ -223,41 +480,76 @@ class GitOps:
         """
         if not self.is_repo():
             raise ValueError(f"目录不是 Git 仓库: {self.work_dir}")
-        
+
+        repo = self._pygit2_repo()
+        if repo is not None and not repo.head_is_unborn:
+            oid = str(repo.head.target)
+            return oid[:7] if short else oid
+
+        oid = self._batch_check("HEAD")
+        if oid:
+            # 短哈希直接截取前 7 位（与 rev-parse --short 的默认长度一致）
+            return oid[:7] if short else oid
+
         args = ["rev-parse"]
         if short:
             args.append("--short")
         args.append("HEAD")
-        
+
         return self.run(args)
     
 
     def init(self) -> None:
         """初始化 Git 仓库"""
         self.run(["init"])
+        self._invalidate_query_cache()
+        # 此前可能探测过“不是仓库”，重置相关缓存以便重新探测
+        self._is_repo_cached = None
+        self._pygit2_handle = None
 
     def add_remote(self, url: str, name: str = "origin") -> None:
         """添加远程仓库"""
         self.run(["remote", "add", name, url])
+        self._invalidate_query_cache()
 
     def has_remote(self) -> bool:
         """检查是否存在远程仓库配置"""
         if not self.is_repo():
             return False
-        
-        # 运行 git remote，如果有输出说明有关联
-        try:
-            output = self.run(["remote"])
-            return bool(output.strip())
-        except RuntimeError:
-            return False
-        
+
+        if "has_remote" not in self._query_cache:
+            repo = self._pygit2_repo()
+            if repo is not None:
+                self._query_cache["has_remote"] = len(repo.remotes) > 0
+            else:
+                # 运行 git remote，如果有输出说明有关联
+                try:
+                    output = self.run(["remote"])
+                    self._query_cache["has_remote"] = bool(output.strip())
+                except RuntimeError:
+                    return False
+        return self._query_cache["has_remote"]
+
     def get_head_hash(self) -> str:
         """检查是否存在 HEAD (是否有提交记录)"""
-        try:
-            return self.run(["rev-parse", "HEAD"])
-        except RuntimeError:
-            return ""
+        if "head_hash" not in self._query_cache:
+            repo = self._pygit2_repo()
+            if repo is not None:
+                self._query_cache["head_hash"] = (
+                    "" if repo.head_is_unborn else str(repo.head.target)
+                )
+            else:
+                oid = self._batch_check("HEAD")
+                if oid is not None:
+                    self._query_cache["head_hash"] = oid
+                else:
+                    try:
+                        self._query_cache["head_hash"] = self.run(
+                            ["rev-parse", "HEAD"]
+                        )
+                    except RuntimeError:
+                        return ""
+        return self._query_cache["head_hash"]
 
     def align_with_remote(self) -> str:
         """[历史对齐] 将本地文件状态与远程仓库历史进行智能对齐
@@ -270,22 +562,30 @@ class GitOps:
         Returns:
             str: 操作结果描述
         """
-        # 1. 制造一个临时的初始提交
+        # 整个流程会多次改写 HEAD / 引用，直接让查询缓存整体失效
+        self._invalidate_query_cache()
+
+        # 1. 暂存本地文件
+        # 只 add 不 commit：reset --mixed 在未诞生的 HEAD 上同样能
+        # 直接把分支引用指到远程提交，省掉"临时根提交 + 失败回滚
+        # (update-ref -d HEAD)"的整套写盘动作
         self.run(["add", "."])
-        self.run(["commit", "-m", "chore: temp commit for history alignment"])
-        
-        # 2. 获取远程历史
+
+        # 2. 获取远程历史（失败时没有临时提交需要回滚）
         try:
-            self.run(["fetch", "origin"])
+            self.run(["fetch", "origin"], stream=True)
         except RuntimeError:
-            # [修正点 1] 如果网络失败，需要回滚根提交
-            # Root Commit 无法使用 reset HEAD~1，必须直接删除 HEAD 引用
-            self.run(["update-ref", "-d", "HEAD"])
             raise RuntimeError("无法获取远程仓库信息，请检查网络或权限。")
         
         # 3. 智能探测远程分支
-        remote_branches = self.run(["branch", "-r"])
-        
+        # for-each-ref 只枚举这两条候选引用并输出精确引用名，
+        # 避免 branch -r 列出全部远程分支后做子串误匹配
+        # （如 origin/maintenance 会被 "origin/main" in ... 命中）
+        remote_branches = self.run([
+            "for-each-ref", "--format=%(refname:short)",
+            "refs/remotes/origin/main", "refs/remotes/origin/master",
+        ]).splitlines()
+
         target_branch = ""
         if "origin/main" in remote_branches:
             target_branch = "origin/main"
@@ -295,11 +595,10 @@ class GitOps:
         # 4. 分情况处理
         if target_branch:
             # A情况：远程有代码 (Zip 恢复 或 远程有 README)
+            # 把当前分支引用与索引对齐到远程提交，工作区文件保持不动
             self.run(["reset", "--mixed", target_branch])
             return f"成功对接远程分支 {target_branch}，历史记录已修复。"
         else:
             # B情况：远程是空的 (Empty Repo)
-            # [修正点 2] 撤销刚才的临时 Root Commit
-            # 使用 update-ref -d HEAD 等同于对根提交做 reset --soft
-            self.run(["update-ref", "-d", "HEAD"])
+            # 本地更改已在暂存区，无事可做，等待用户做初始提交
             return "远程仓库为空，已保留本地更改，准备好进行初始提交。"
\ No newline at end of file
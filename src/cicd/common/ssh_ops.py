@@ -1,18 +1,28 @@
 """SSH 操作工具类"""
+import os
 import subprocess
+import tempfile
+import uuid
 from typing import Optional
 
 
 class SSHOps:
     """SSH 远程命令执行工具类
-    
+
     使用系统 ssh 命令执行远程操作，前提 SSH Key 已配置。
+
+    支持连接复用：所有命令都带 ControlMaster=auto (OpenSSH Multiplexing)，
+    第一条命令自动建立主连接，后续命令复用同一条 TCP/SSH 通道，
+    免去每条命令重新握手认证的开销。推荐配合 with 语句使用::
+
+        with SSHOps(host, user, port) as ssh_ops:
+            ssh_ops.run_remote_command("...")
     """
-    
-    def __init__(self, host: Optional[str] = None, user: Optional[str] = None, 
+
+    def __init__(self, host: Optional[str] = None, user: Optional[str] = None,
                  port: int = 22):
         """初始化 SSH 操作工具
-        
+
         Args:
             host: 远程主机地址
             user: 远程用户名
@@ -21,7 +31,73 @@ class SSHOps:
         self.host = host
         self.user = user
         self.port = port
-    
+        # 主连接的 Control Socket 路径；用随机名避免多个实例/进程互撞
+        self._control_path = os.path.join(
+            tempfile.gettempdir(), f"cicd-ssh-{uuid.uuid4().hex}.sock"
+        )
+
+    def _mux_opts(self) -> list[str]:
+        """返回连接复用相关的 ssh 选项
+
+        ControlMaster=auto: 没有主连接就顺手建一条，有则直接复用；
+        ControlPersist=60: 最后一个会话结束后主连接再保活 60 秒，
+        即使不走 with 语句，紧凑的连续命令也能自然共享连接。
+        """
+        return [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._control_path}",
+            "-o", "ControlPersist=60",
+        ]
+
+    def connect(self) -> None:
+        """预热 SSH 主连接
+
+        可选步骤：即使不调用，第一条远程命令也会自动建立主连接。
+        这里只是提前支付握手认证的成本，让后续命令全部走复用路径。
+
+        Raises:
+            ValueError: 当缺少必要参数时
+            RuntimeError: 当主连接建立失败时
+        """
+        if not self.host:
+            raise ValueError("必须提供远程主机地址 (host)")
+        if not self.user:
+            raise ValueError("必须提供远程用户名 (user)")
+
+        cmd = (["ssh"] + self._mux_opts()
+               + ["-p", str(self.port), f"{self.user}@{self.host}", "true"])
+
+        try:
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.strip() if e.stderr else "未知错误"
+            raise RuntimeError(f"SSH 主连接建立失败: {error_msg}")
+        except FileNotFoundError:
+            raise RuntimeError("ssh 命令不可用，请确保系统已安装 OpenSSH")
+
+    def close(self) -> None:
+        """关闭主连接（不存在时静默返回）"""
+        if not (self.host and self.user):
+            return
+
+        subprocess.run(
+            ["ssh", "-o", f"ControlPath={self._control_path}",
+             "-O", "exit", f"{self.user}@{self.host}"],
+            capture_output=True
+        )
+
+    def __enter__(self) -> "SSHOps":
+        # 主连接建立失败不在此处抛错：后续命令会退回到
+        # 逐条连接的模式，并在执行时给出更具体的错误信息
+        try:
+            self.connect()
+        except (ValueError, RuntimeError):
+            pass
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def run_remote_command(self, command: str) -> str:
         """在远程服务器上执行命令
         
@@ -45,9 +121,11 @@ class SSHOps:
         if not target_user:
             raise ValueError("必须提供远程用户名 (user)")
         
-        # 构建 SSH 命令
+        # 构建 SSH 命令（ControlMaster=auto：首条命令建立主连接，
+        # 后续命令直接复用，避免重新握手）
         ssh_target = f"{target_user}@{target_host}"
-        ssh_cmd = ["ssh", "-p", str(target_port), ssh_target, command]
+        ssh_cmd = (["ssh"] + self._mux_opts()
+                   + ["-p", str(target_port), ssh_target, command])
         
         try:
             result = subprocess.run(
@@ -66,21 +144,56 @@ class SSHOps:
         except FileNotFoundError:
             raise RuntimeError("ssh 命令不可用，请确保系统已安装 OpenSSH")
     
-    def test_connection(self, host: Optional[str] = None, 
+    def test_connection(self, host: Optional[str] = None,
                        user: Optional[str] = None,
                        port: Optional[int] = None) -> bool:
         """测试 SSH 连接是否正常
-        
+
         Args:
-            host: 远程主机地址
-            user: 远程用户名
-            port: SSH 端口
-            
+            host: 远程主机地址（默认用实例属性）
+            user: 远程用户名（默认用实例属性）
+            port: SSH 端口（默认用实例属性）
+
         Returns:
             连接成功返回 True，否则返回 False
         """
+        target_host = host or self.host
+        target_user = user or self.user
+        target_port = port if port is not None else self.port
+
+        if not target_host or not target_user:
+            return False
+
+        ssh_target = f"{target_user}@{target_host}"
+
+        # ControlPath 是固定文件名，socket 上挂着哪台主机的主连接，
+        # ssh 就复用哪台——只有目标与实例完全一致时才能走复用路径，
+        # 否则会测到错误的机器、或给别的主机建一条挂在本实例
+        # socket 上的主连接
+        same_target = (target_host == self.host
+                       and target_user == self.user
+                       and target_port == self.port)
+
+        # 目标与实例一致时，先问本地主连接是否存活 (-O check)：
+        # 纯本地 socket 探测，不产生任何网络往返
+        if same_target:
+            result = subprocess.run(
+                ["ssh", "-o", f"ControlPath={self._control_path}",
+                 "-O", "check", ssh_target],
+                capture_output=True
+            )
+            if result.returncode == 0:
+                return True
+
+        # 退路：真实连一次远端。BatchMode 禁止交互式询问密码，
+        # ConnectTimeout 限制等待时长，避免探测把整个流程挂住
+        probe_cmd = ["ssh"]
+        if same_target:
+            probe_cmd += self._mux_opts()
+        probe_cmd += ["-o", "BatchMode=yes", "-o", "ConnectTimeout=3",
+                      "-p", str(target_port), ssh_target, "true"]
         try:
-            self.run_remote_command("echo 'connection test'", host, user, port)
-            return True
-        except (ValueError, RuntimeError):
+            result = subprocess.run(probe_cmd, capture_output=True)
+            return result.returncode == 0
+        except FileNotFoundError:
             return False
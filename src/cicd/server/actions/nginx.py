@@ -1,9 +1,9 @@
 import os
-import glob
+import shlex
 import subprocess
-from typing import Dict, Any
+from typing import Any, Mapping
 
-def run(context: Dict[str, Any]) -> None:
+def run(context: Mapping[str, Any]) -> None:
     """
     Nginx 部署插件逻辑
     
@@ -29,12 +29,17 @@ def run(context: Dict[str, Any]) -> None:
     sites_available = "/etc/nginx/sites-available"
     sites_enabled = "/etc/nginx/sites-enabled"
 
-    # 检查源目录：如果项目里根本没建 nginx 目录，优雅退出，不视为错误
-    if not os.path.exists(abs_local_dir):
+    # 一次 scandir 同时完成目录存在性探测与 .conf 过滤
+    # （项目里根本没建 nginx 目录时优雅退出，不视为错误）
+    try:
+        with os.scandir(abs_local_dir) as entries:
+            conf_files = sorted(
+                e.path for e in entries
+                if e.is_file() and e.name.endswith(".conf")
+            )
+    except (FileNotFoundError, NotADirectoryError):
         return
 
-    # 查找所有 .conf 文件
-    conf_files = glob.glob(os.path.join(abs_local_dir, "*.conf"))
     if not conf_files:
         return
 
@@ -47,41 +52,31 @@ def run(context: Dict[str, Any]) -> None:
         print("🔒 正在请求 sudo 权限以配置 Nginx...")
         subprocess.run(["sudo", "-v"], check=True)
 
+        # 所有 cp/ln/语法校验/平滑重载 通过 && 串联，交给同一个
+        # 提权 shell 一次执行：N 个文件只需 1 次 sudo + 1 次进程创建，
+        # 任意一步失败都会中断后续步骤
+        parts = []
         for conf_file in conf_files:
             filename = os.path.basename(conf_file)
             target_path = os.path.join(sites_available, filename)
             link_path = os.path.join(sites_enabled, filename)
-            
-            # A. 复制配置文件 (覆盖模式)
-            # sudo cp ./nginx/xxx.conf /etc/nginx/sites-available/xxx.conf
-            subprocess.run(
-                ["sudo", "cp", "-f", conf_file, target_path], 
-                check=True
-            )
-            
-            # B. 创建软链接 (强制模式)
-            # sudo ln -sf /etc/nginx/sites-available/xxx.conf /etc/nginx/sites-enabled/xxx.conf
-            subprocess.run(
-                ["sudo", "ln", "-sf", target_path, link_path], 
-                check=True
+            parts.append(
+                f"cp -f {shlex.quote(conf_file)} {shlex.quote(target_path)}"
+                f" && ln -sf {shlex.quote(target_path)}"
+                f" {shlex.quote(link_path)}"
             )
+        # 语法校验通过后平滑重载 (不中断现有连接)
+        parts.append("nginx -t")
+        parts.append("nginx -s reload")
+        script = " && ".join(parts)
 
-        # ==========================================
-        # 3. 校验与生效
-        # ==========================================
-        
-        # C. 语法校验
-        # sudo nginx -t
-        subprocess.run(
-            ["sudo", "nginx", "-t"], 
-            check=True
-        )
-        
-        # D. 平滑重载配置 (不中断现有连接)
-        # sudo nginx -s reload
+        # -n: 凭证已由上面的 sudo -v 缓存，这里绝不允许再次交互询问
+        # 密码——stdout/stderr 都被捕获，提示根本显示不出来，
+        # 没有 -n 的话撞上凭证过期会静默挂死整个部署
         subprocess.run(
-            ["sudo", "nginx", "-s", "reload"], 
-            check=True
+            ["sudo", "-n", "sh", "-c", script],
+            check=True,
+            capture_output=True
         )
 
     except subprocess.CalledProcessError as e:
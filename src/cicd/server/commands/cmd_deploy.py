@@ -1,13 +1,15 @@
 import os
+from pathlib import Path
+from types import MappingProxyType
+
 import typer
-from rich.console import Console
 from rich.panel import Panel
 
+from cicd.common.console import console
 from cicd.common.git_ops import GitOps
-from cicd.common.config_ops import ConfigOps
+from cicd.common.config_ops import get_config_ops
 from cicd.server.utils.executor import Executor
 
-console = Console()
 executor = Executor()
 
 def run(repo_path: str, env: str, branch: str):
@@ -19,20 +21,22 @@ def run(repo_path: str, env: str, branch: str):
         branch: Git 分支 (main, develop)
     """
 
-    # 1. 检查仓库路径
-    abs_repo_path = os.path.abspath(repo_path)
-    if not os.path.exists(abs_repo_path):
-        console.print(f"[yellow]⚠️  仓库路径不存在，正在自动创建: {abs_repo_path}[/]")
-        try:
-            # exist_ok=True: 目录已存在也不报错
-            # mode=0o755: 设置权限 (rwxr-xr-x)
-            os.makedirs(abs_repo_path, mode=0o755, exist_ok=True)
-        except OSError as e:
-            console.print(f"[red]❌ 无法创建部署目录 (请检查权限): {e}[/]")
-            raise typer.Exit(code=1)
-    
-    os.chdir(abs_repo_path)
-    cwd = os.getcwd()
+    # 1. 检查仓库路径（resolve 一次得到绝对路径，后续直接复用，
+    # 不再用 chdir 之后的 getcwd() 反查）
+    cwd = Path(repo_path).resolve()
+    if not cwd.is_dir():
+        console.print(f"[yellow]⚠️  仓库路径不存在，正在自动创建: {cwd}[/]")
+    try:
+        # exist_ok=True 让 mkdir 自己处理"目录已存在"，
+        # 不必在调用前再 stat 一次探测存在性
+        # mode=0o755: 设置权限 (rwxr-xr-x)
+        cwd.mkdir(mode=0o755, parents=True, exist_ok=True)
+    except OSError as e:
+        console.print(f"[red]❌ 无法创建部署目录 (请检查权限): {e}[/]")
+        raise typer.Exit(code=1)
+
+    os.chdir(cwd)
+    cwd = str(cwd)
     console.print(Panel(f"🚀 开始部署任务\n路径: {cwd}\n环境: [bold cyan]{env}[/]\n分支: [bold magenta]{branch}[/]", title="CICD Runner"))
 
     # ----------------------------------------------------
@@ -49,16 +53,10 @@ def run(repo_path: str, env: str, branch: str):
     # ==========================================
     console.print("[bold blue]1️⃣  同步代码仓库[/]")
     try:
-        console.print(f"[dim]⚡ Fetching origin...[/dim]")
-        git_ops.fetch() # 默认 fetch origin
-        
-        console.print(f"[dim]⚡ Checkout {branch}...[/dim]")
-        git_ops.checkout(branch)
-        
-        console.print(f"[dim]⚡ Pulling latest code...[/dim]")
-        # 这里指定分支拉取，对应 git pull origin {branch}
-        git_ops.pull(branch=branch)
-            
+        # fetch + checkout + pull 合并为一次 git 进程链
+        console.print(f"[dim]⚡ Syncing {branch} (fetch/checkout/pull)...[/dim]")
+        git_ops.sync(branch=branch)
+
     except RuntimeError as e:
         # GitOps 抛出的是 RuntimeError，这里捕获并打印
         console.print(f"[red]❌ 代码同步失败: {e}[/]")
@@ -72,7 +70,7 @@ def run(repo_path: str, env: str, branch: str):
     # ----------------------------------------------------
     try:
         # 实例化 ConfigOps (默认读取当前目录下的 cicd-config.yaml)
-        config_ops = ConfigOps() 
+        config_ops = get_config_ops()
         config = config_ops.load_config()
         
     except FileNotFoundError:
@@ -103,13 +101,15 @@ def run(repo_path: str, env: str, branch: str):
     # ----------------------------------------------------
     # 5. 准备上下文 (Context)
     # ----------------------------------------------------
-    context = {
+    # 只读视图：steps 可能并行执行（嵌套列表），冻结上下文
+    # 保证没有哪个步骤能在中途改掉别人的变量
+    context = MappingProxyType({
         "branch": branch,
         "deploy_path": deploy_path,
         "project_name": config.get("project_name", "unknown"),
         "cwd": cwd,
         "env": env
-    }
+    })
 
     # ----------------------------------------------------
     # 6. 执行 Steps
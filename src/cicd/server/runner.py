@@ -1,10 +1,7 @@
 import typer
-from rich.console import Console
+from cicd.common.console import console  # 全局共享的 Console 实例
 from cicd.server.commands import cmd_deploy
 
-
-console = Console() # 美化命令行输出
-
 # 初始化主应用
 app = typer.Typer(
     help="🚀 CICD 服务端 Runner 工具",
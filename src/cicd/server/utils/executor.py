@@ -1,7 +1,20 @@
+import importlib
+import re
+import shlex
 import subprocess
-from typing import Dict, Any, Union
-# 引入插件
-from cicd.server.actions import nginx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Mapping, Union
+
+# Action 插件注册表：action 名 -> 模块路径。
+# 插件模块在首次被某个 step 用到时才 import，新增插件只需在此
+# 登记一行，启动阶段不再为用不到的插件付 import 成本
+_ACTIONS = {
+    "nginx": "cicd.server.actions.nginx",
+}
+
+# 需要真正的 shell 才能解释的字符：管道/重定向/变量/子命令/通配符/
+# 引号/环境变量赋值等。命令里一个都没有时可以跳过 /bin/sh 直接 exec
+_SHELL_META_RE = re.compile(r'[|&;<>$`(){}\[\]*?~#=\\"\'\n]')
 
 class Executor:
     """执行器：负责逻辑分发"""
@@ -10,30 +23,49 @@ class Executor:
     def run_shell(cmd: str) -> None:
         """
         执行 Shell 命令
-        
+
+        简单命令（不含 shell 元字符）直接 exec，省掉中间的
+        /bin/sh 进程；含管道、重定向、变量等语法时仍交给 shell。
+
         Raises:
             subprocess.CalledProcessError: 执行失败时抛出
         """
         # 这里不捕获 stdout，允许命令自身的输出直接显示在终端（如 npm install 的进度条）
         # 但 Executor 本身不产生额外的 print
-        subprocess.run(cmd, shell=True, check=True)
+        if not _SHELL_META_RE.search(cmd):
+            subprocess.run(shlex.split(cmd), check=True)
+        else:
+            subprocess.run(cmd, shell=True, check=True)
 
     @staticmethod
-    def dispatch_step(step: Union[str, Dict], context: Dict[str, Any]) -> None:
+    def dispatch_step(step: Union[str, Dict, List],
+                      context: Mapping[str, Any]) -> None:
         """
         分发步骤
-        
+
         Raises:
             KeyError: 变量替换失败
             ValueError: 格式错误
             RuntimeError: 执行过程错误
         """
-        
+
+        # 场景 C: 列表 -> 子步骤并行执行
+        # YAML 里把一组互不依赖的步骤写成嵌套列表（如同时构建前后端），
+        # 这里用线程池并发跑完；list(map) 会等全部结束并把任一子步骤的
+        # 异常原样抛给上层
+        if isinstance(step, list):
+            with ThreadPoolExecutor(max_workers=len(step) or 1) as pool:
+                list(pool.map(
+                    lambda sub: Executor.dispatch_step(sub, context), step
+                ))
+            return
+
         # 场景 A: 字符串 -> Shell 执行
         if isinstance(step, str):
             try:
-                # 变量替换
-                cmd = step.format(**context)
+                # 变量替换；format_map 直接读 context，
+                # 不像 format(**context) 那样先把映射整份拷贝成 kwargs
+                cmd = step.format_map(context)
                 Executor.run_shell(cmd)
             except KeyError as e:
                 raise KeyError(f"配置文件使用了未知变量: {e}")
@@ -44,12 +76,13 @@ class Executor:
         # 场景 B: 字典 -> Action 部署
         elif isinstance(step, dict) and "action" in step:
             action_name = step["action"]
-            
-            if action_name == "nginx":
-                # 直接调用 action 模块
-                nginx.run(context)
-            else:
+
+            module_path = _ACTIONS.get(action_name)
+            if module_path is None:
                 raise ValueError(f"不支持的 Action 类型: {action_name}")
+
+            # 惰性加载插件模块并调用（import 结果由 sys.modules 缓存）
+            importlib.import_module(module_path).run(context)
                 
         else:
             raise ValueError(f"无法识别的步骤格式: {step}")
\ No newline at end of file